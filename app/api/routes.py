@@ -1,58 +1,488 @@
-from fastapi import APIRouter, HTTPException, Query, status, Body
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Body
 from typing import List, Optional, Dict, Any
+from bisect import bisect_left, insort
+import hashlib
+import itertools
 import json
 import os
 import re
+import threading
 
-from app.models.profile import StringRecord
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from app.models.profile import StringRecord, build_record
 from app.core.config import settings
 
 router = APIRouter()
 
-# JSON file database
-DATA_FILE = settings.DATA_FILE
+# settings.DATA_FILE is a JSON Lines file database: one record per line,
+# deletions appended as {"deleted": "<id>"} tombstones until the file is
+# compacted. The path is read on every call so it can be changed at runtime.
+
+
+def _new_cache(path: Optional[str]) -> dict:
+    """Create an empty cache entry for path"""
+    return {
+        "path": path,
+        "mtime": None,
+        "size": None,
+        "tombstones": 0,
+        # Records by position; a deleted record leaves a None hole so the
+        # positions in the indices below stay valid until compaction
+        "data": [],
+        "deleted": set(),
+        "by_id": {},
+        "by_value": {},
+        # Record id -> position in data
+        "positions": {},
+        # Character -> positions of the records whose value contains it
+        "char_index": {},
+        # Positions of the palindromic records
+        "palindromes": set(),
+        # Word count -> positions of the records with that many words
+        "word_count_index": {},
+        # (length, position) pairs sorted by length, for range filters
+        "length_index": [],
+    }
+
+
+def _index_record(cache: dict, item: dict):
+    """Append a record to a cache entry and all of its indices"""
+    idx = len(cache["data"])
+    properties = item["properties"]
+
+    cache["data"].append(item)
+    cache["by_id"][item["id"]] = item
+    cache["by_value"][item["value"]] = item
+    cache["positions"][item["id"]] = idx
+
+    if properties["is_palindrome"]:
+        cache["palindromes"].add(idx)
+    cache["word_count_index"].setdefault(properties["word_count"], set()).add(idx)
+    if cache["length_index"] is not None:
+        insort(cache["length_index"], (properties["length"], idx))
+
+    # The frequency map already lists every distinct character once
+    for char in properties["character_frequency_map"]:
+        cache["char_index"].setdefault(char, set()).add(idx)
+
+
+def _unindex_record(cache: dict, record_id: str):
+    """Remove a record from a cache entry and all of its indices, leaving a hole"""
+    idx = cache["positions"].pop(record_id)
+    item = cache["data"][idx]
+    properties = item["properties"]
+
+    cache["data"][idx] = None
+    cache["deleted"].add(idx)
+    del cache["by_id"][record_id]
+    del cache["by_value"][item["value"]]
+
+    cache["palindromes"].discard(idx)
+    _discard_position(cache["word_count_index"], properties["word_count"], idx)
+    length_index = cache["length_index"]
+    del length_index[bisect_left(length_index, (properties["length"], idx))]
+
+    for char in properties["character_frequency_map"]:
+        _discard_position(cache["char_index"], char, idx)
+
+
+def _discard_position(index: dict, key: Any, idx: int):
+    """Remove a position from an index's set, dropping the set once empty"""
+    positions = index[key]
+    positions.discard(idx)
+    if not positions:
+        del index[key]
+
+
+def _live_records(cache: dict) -> List[dict]:
+    """Records of a cache entry in insertion order, skipping deletion holes"""
+    if not cache["deleted"]:
+        return list(cache["data"])
+    return [item for item in cache["data"] if item is not None]
+
+
+def _build_cache(path: Optional[str], data: List[dict], tombstones: int = 0) -> dict:
+    """Build a cache entry for data, including its id, value and property indices"""
+    cache = _new_cache(path)
+    cache["tombstones"] = tombstones
+    # Sort the length index once instead of inserting every record into it
+    cache["length_index"] = None
+    for item in data:
+        _index_record(cache, item)
+    cache["length_index"] = sorted((item["properties"]["length"], idx) for idx, item in enumerate(data))
+    return cache
+
 
+def _stamp(cache: dict):
+    """Record the current mtime/size of the cache entry's file"""
+    if settings.USE_MEMORY_STORE:
+        # Nothing is on disk; a process-wide counter tells states apart
+        cache["mtime"], cache["size"] = None, next(_memory_versions)
+        return
+    stat = os.stat(cache["path"])
+    cache["mtime"] = stat.st_mtime_ns
+    cache["size"] = stat.st_size
 
-def load_data() -> List[dict]:
-    """Load data from JSON file"""
-    if not os.path.exists(DATA_FILE):
-        return []
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
+
+# Data file (de)serializers, one JSON record per line
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(item: dict) -> bytes:
+        return orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    _loads = json.loads
+
+    def _dumps(item: dict) -> bytes:
+        return (json.dumps(item, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize content into a JSON response
+
+    GET handlers return this directly: stored records are already JSON-ready,
+    so FastAPI's encoder and response_model validation are skipped.
+    """
+    if orjson is not None:
+        body = orjson.dumps(content)
+    else:
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _parse_lines(f) -> tuple:
+    """Replay a JSON Lines data file, returning (records, tombstone count)"""
+    records = {}
+    tombstones = 0
+    for line in f:
+        if not line.strip():
+            continue
         try:
-            return json.load(f)
+            item = _loads(line)
         except json.JSONDecodeError:
-            return []
+            # Skip lines left incomplete by an interrupted write
+            continue
+        # Skip lines that are valid JSON but not a record or tombstone
+        if not isinstance(item, dict):
+            continue
+        if "deleted" in item:
+            records.pop(item["deleted"], None)
+            tombstones += 1
+        elif all(key in item for key in ("id", "value", "properties")):
+            records[item["id"]] = item
+    return list(records.values()), tombstones
+
+
+def _append(data_file: str, payload: bytes):
+    """Append payload to the data file, on a line of its own"""
+    with open(data_file, "a+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            # Terminate a line left incomplete by an interrupted write, so it
+            # doesn't swallow the first record written after it
+            if f.read(1) != b"\n":
+                payload = b"\n" + payload
+        f.write(payload)
 
 
-def save_data(data: List[dict]):
-    """Save data to JSON file"""
-    # Ensure directory exists
-    dir_path = os.path.dirname(DATA_FILE)
+def _ensure_data_dir(data_file: str):
+    dir_path = os.path.dirname(data_file)
     if dir_path:
         os.makedirs(dir_path, exist_ok=True)
-    
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
 
 
-@router.post("/strings", response_model=StringRecord, status_code=status.HTTP_201_CREATED, tags=["Strings"])
-async def analyze_string(payload: Dict[str, Any] = Body(...)):
+# Natural language query phrases, combined into one pattern so the query is
+# scanned in a single pass. Each alternative sits in a lookahead so phrases
+# may overlap, and they all start with a different letter so at most one
+# matches at any position.
+_NL_TOKEN_RE = re.compile(
+    r"(?="
+    r"(?P<palindrome>palindrome|palindromic)"
+    r"|(?P<single>single word)"
+    r"|(?P<one>one word)"
+    r"|longer than (?P<longer>\d+)"
+    r"|more than (?P<more>\d+) character"
+    r"|contain(?:s|ing)?\s+(?:the\s+)?(?:letter\s+)?(?P<letter>[a-z])"
+    r"|(?P<vowel>first vowel)"
+    r")"
+)
+_NL_TOKEN_FILTERS = {
+    "palindrome": "is_palindrome",
+    "single": "word_count",
+    "one": "word_count",
+    "longer": "min_length",
+    "more": "min_length",
+    "letter": "contains_character",
+    "vowel": "first_vowel",
+}
+
+# In-memory copy of the data file, reused until the file's mtime/size change
+_cache = _new_cache(None)
+_cache_lock = threading.RLock()
+
+# Stands in for the file's mtime/size when settings.USE_MEMORY_STORE is set
+_memory_versions = itertools.count()
+
+
+def load_cache() -> dict:
     """
-    Create and analyze a new string
-    
+    Load data from JSON Lines file into the in-memory cache
+
+    The file is only re-read when it changes on disk, and never with
+    settings.USE_MEMORY_STORE. The returned entry is shared between requests
+    and must only be changed through append_record, delete_record and
+    rewrite_all. append_record and delete_record update it in place, so hold
+    _cache_lock while reading more than a single index lookup from it.
+    """
+    global _cache
+    data_file = settings.DATA_FILE
+    with _cache_lock:
+        if settings.USE_MEMORY_STORE:
+            return _cache
+
+        try:
+            stat = os.stat(data_file)
+        except FileNotFoundError:
+            if _cache["path"] is not None:
+                _cache = _new_cache(None)
+            return _cache
+
+        key = (data_file, stat.st_mtime_ns, stat.st_size)
+        if (_cache["path"], _cache["mtime"], _cache["size"]) == key:
+            return _cache
+
+        with open(data_file, "rb") as f:
+            legacy = f.read(1) == b"["
+            f.seek(0)
+            if legacy:
+                # Data file written by the old single JSON array format. Only
+                # migrate it when it parses; never overwrite a file we can't read.
+                try:
+                    data = _loads(f.read())
+                except json.JSONDecodeError as e:
+                    raise ValueError("Legacy data file is not a valid JSON array; left untouched") from e
+            else:
+                data, tombstones = _parse_lines(f)
+
+        if legacy:
+            return rewrite_all(data)
+
+        _cache = _build_cache(data_file, data, tombstones)
+        _cache["mtime"], _cache["size"] = stat.st_mtime_ns, stat.st_size
+        return _cache
+
+
+def append_record(record: dict) -> bool:
+    """
+    Append a single record to the data file
+
+    Returns:
+        False if a record with the same id is already stored, True otherwise
+    """
+    return append_records([record])[0]
+
+
+def append_records(records: List[dict]) -> List[bool]:
+    """
+    Append records to the data file in a single write
+
+    Returns:
+        For each record, False if a record with the same id is already stored
+        (or appears earlier in records), True otherwise
+    """
+    data_file = settings.DATA_FILE
+    with _cache_lock:
+        cache = load_cache()
+        seen = set()
+        appended = []
+        for record in records:
+            is_new = record["id"] not in cache["by_id"] and record["id"] not in seen
+            seen.add(record["id"])
+            appended.append(is_new)
+
+        new_records = [record for record, is_new in zip(records, appended) if is_new]
+        if not new_records:
+            return appended
+
+        if not settings.USE_MEMORY_STORE:
+            _ensure_data_dir(data_file)
+            _append(data_file, b"".join(_dumps(record) for record in new_records))
+
+        if cache["path"] is None:
+            cache["path"] = data_file
+        for record in new_records:
+            _index_record(cache, record)
+        _stamp(cache)
+        return appended
+
+
+def delete_record(record: dict) -> bool:
+    """
+    Delete a stored record by appending a tombstone to the data file
+
+    The record is removed from the in-memory indices in place. The file (and
+    the cache's position holes) are compacted once settings.COMPACT_THRESHOLD
+    tombstones pile up.
+
+    Returns:
+        False if the record is not stored, True otherwise
+    """
+    data_file = settings.DATA_FILE
+    with _cache_lock:
+        cache = load_cache()
+        if record["id"] not in cache["by_id"]:
+            return False
+
+        if cache["tombstones"] + 1 >= settings.COMPACT_THRESHOLD:
+            rewrite_all([item for item in _live_records(cache) if item["id"] != record["id"]])
+            return True
+
+        if not settings.USE_MEMORY_STORE:
+            _append(data_file, _dumps({"deleted": record["id"]}))
+
+        # Positions stay stable; only compaction renumbers them
+        _unindex_record(cache, record["id"])
+        cache["tombstones"] += 1
+        _stamp(cache)
+        return True
+
+
+def rewrite_all(records: List[dict]) -> dict:
+    """Rewrite the data file with exactly records, dropping all tombstones"""
+    global _cache
+    data_file = settings.DATA_FILE
+    tmp_path = f"{data_file}.tmp"
+
+    with _cache_lock:
+        if not settings.USE_MEMORY_STORE:
+            _ensure_data_dir(data_file)
+            with open(tmp_path, "wb") as f:
+                f.writelines(_dumps(item) for item in records)
+            os.replace(tmp_path, data_file)
+
+        _cache = _build_cache(data_file, records)
+        _stamp(_cache)
+        return _cache
+
+
+def reset_store():
+    """Drop every stored string, removing the data file and the in-memory cache"""
+    global _cache
+    with _cache_lock:
+        if not settings.USE_MEMORY_STORE:
+            try:
+                os.remove(settings.DATA_FILE)
+            except FileNotFoundError:
+                pass
+        _cache = _new_cache(None)
+
+
+def filter_records(filters: Dict[str, Any]) -> List[dict]:
+    """
+    Apply property filters to the stored records
+
     Args:
-        payload: Dictionary containing 'value' field
-        
+        filters: Any of is_palindrome, min_length, max_length, word_count
+            and contains_character
+
     Returns:
-        StringRecord with analysis properties
-        
-    Raises:
-        400: If 'value' field is missing
-        409: If string already exists (duplicate hash)
-        422: If 'value' is not a string
+        New list of matching records, in insertion order
+    """
+    # Hold the lock so a concurrent insert can't change the entry mid-scan
+    with _cache_lock:
+        return _filter_cache(load_cache(), filters)
+
+
+def _filter_cache(cache: dict, filters: Dict[str, Any]) -> List[dict]:
+    """
+    Apply property filters to the records of a cache entry
+
+    Each filter looks up the set of record positions it keeps in the entry's
+    indices. The sets are intersected smallest first, so the candidates
+    shrink as fast as possible, and records are only materialized at the end.
+
+    Args:
+        cache: Cache entry returned by load_cache
+        filters: Any of is_palindrome, min_length, max_length, word_count
+            and contains_character
+
+    Returns:
+        Matching records, in insertion order
     """
+    data = cache["data"]
+    # Position sets a record must be in, and must not be in
+    required = []
+    excluded = []
+
+    if "is_palindrome" in filters:
+        if filters["is_palindrome"]:
+            required.append(cache["palindromes"])
+        else:
+            excluded.append(cache["palindromes"])
+
+    if "min_length" in filters or "max_length" in filters:
+        length_index = cache["length_index"]
+        lo = bisect_left(length_index, (filters.get("min_length", 0),))
+        hi = len(length_index)
+        if "max_length" in filters:
+            hi = bisect_left(length_index, (filters["max_length"] + 1,), lo)
+        required.append({idx for _, idx in length_index[lo:hi]})
+
+    if "word_count" in filters:
+        required.append(cache["word_count_index"].get(filters["word_count"], set()))
+
+    # contains_character is case-sensitive and answered from the posting lists
+    if "contains_character" in filters:
+        required.append(cache["char_index"].get(filters["contains_character"], set()))
+
+    if not required and not excluded:
+        return _live_records(cache)
+
+    if required:
+        required.sort(key=len)
+        candidates = set(required[0])
+        for positions in required[1:]:
+            if not candidates:
+                return []
+            candidates &= positions
+    else:
+        candidates = set(range(len(data))) - cache["deleted"]
+
+    for positions in excluded:
+        candidates -= positions
+
+    return [data[idx] for idx in sorted(candidates)]
+
+
+def _etag(cache: dict, key: str) -> str:
+    """ETag for a response built from a cache entry, varying with key"""
+    state = f"{cache['path']}:{cache['mtime']}:{cache['size']}:{key}"
+    return '"' + hashlib.blake2b(state.encode("utf-8"), digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    # Clients may keep the body but have to revalidate it on every use
+    return {"ETag": etag, "Cache-Control": "private, max-age=0"}
+
+
+def _validate_value(payload: Any) -> str:
+    """Extract the string to analyze from a request payload"""
     # Check if 'value' key exists
-    if "value" not in payload:
+    if not isinstance(payload, dict) or "value" not in payload:
         raise HTTPException(status_code=400, detail="Missing 'value' field")
     
     value = payload.get("value")
@@ -64,24 +494,101 @@ async def analyze_string(payload: Dict[str, Any] = Body(...)):
     # Check if value is a string
     if not isinstance(value, str):
         raise HTTPException(status_code=422, detail="Invalid data type for 'value' (must be string)")
+    
+    return value
+
+
+@router.post("/strings", response_model=StringRecord, status_code=status.HTTP_201_CREATED, tags=["Strings"])
+def analyze_string(payload: Dict[str, Any] = Body(...)):
+    """
+    Create and analyze a new string
+    
+    Args:
+        payload: Dictionary containing 'value' field
+        
+    Returns:
+        StringRecord with analysis properties
+        
+    Raises:
+        400: If 'value' field is missing
+        409: If string already exists (duplicate hash)
+        422: If 'value' is not a string
+    """
+    value = _validate_value(payload)
 
-    record = StringRecord.create(value)
-    data = load_data()
+    # Check for duplicate value before hashing and analyzing it
+    if value in load_cache()["by_value"]:
+        raise HTTPException(status_code=409, detail="String already exists in the system")
+
+    record = build_record(value)
 
-    # Check for duplicate SHA256 hash
-    if any(item["id"] == record.id for item in data):
+    # Check again by SHA256 hash in case the string was stored meanwhile
+    if not append_record(record):
         raise HTTPException(status_code=409, detail="String already exists in the system")
 
-    data.append(record.model_dump())
-    save_data(data)
     return record
 
 
+@router.post("/strings:bulk", tags=["Strings"])
+def analyze_strings_bulk(payload: List[Any] = Body(...)):
+    """
+    Create and analyze several strings in one request
+    
+    All new strings are stored with a single write. Items are validated like
+    POST /strings, and a failing item does not affect the others.
+    
+    Args:
+        payload: List of dictionaries, each containing a 'value' field
+        
+    Returns:
+        Dictionary with per-item results (value, status, detail or record)
+        in request order, count of items, and number created
+    """
+    results = []
+    pending = {}
+    
+    for item in payload:
+        value = item.get("value") if isinstance(item, dict) else None
+        try:
+            value = _validate_value(item)
+        except HTTPException as e:
+            results.append({"value": value, "status": e.status_code, "detail": e.detail})
+            continue
+        
+        # Look the cache up per item: a concurrent delete or reload may replace it
+        if value in load_cache()["by_value"] or value in pending:
+            results.append({"value": value, "status": 409, "detail": "String already exists in the system"})
+            continue
+        
+        result = {"value": value, "status": 201, "record": build_record(value)}
+        pending[value] = result
+        results.append(result)
+    
+    # Strings stored by another request meanwhile are reported as duplicates
+    records = [result["record"] for result in pending.values()]
+    for result, appended in zip(pending.values(), append_records(records)):
+        if not appended:
+            del result["record"]
+            result.update(status=409, detail="String already exists in the system")
+    
+    return {
+        "data": results,
+        "count": len(results),
+        "created": sum(result["status"] == 201 for result in results),
+    }
+
+
 @router.get("/strings/filter-by-natural-language", tags=["Strings"])
-async def filter_by_natural_language(query: str = Query(..., description="Natural language query")):
+def filter_by_natural_language(
+    request: Request,
+    query: str = Query(..., description="Natural language query"),
+):
     """
     Filter strings using natural language query
     
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
+    until the stored strings change.
+    
     Args:
         query: Natural language query string
         
@@ -96,28 +603,29 @@ async def filter_by_natural_language(query: str = Query(..., description="Natura
     parsed_filters = {}
     
     try:
-        # Parse "palindrome" or "palindromic"
-        if "palindrome" in query_lower or "palindromic" in query_lower:
+        # Scan the query once, keeping the first occurrence of each phrase
+        found = {}
+        for match in _NL_TOKEN_RE.finditer(query_lower):
+            kind = match.lastgroup
+            found.setdefault(_NL_TOKEN_FILTERS[kind], match.group(kind))
+        
+        # "palindrome" or "palindromic"
+        if "is_palindrome" in found:
             parsed_filters["is_palindrome"] = True
         
-        # Parse "single word" or "one word"
-        if "single word" in query_lower or "one word" in query_lower:
+        # "single word" or "one word"
+        if "word_count" in found:
             parsed_filters["word_count"] = 1
         
-        # Parse "longer than X characters" or "more than X characters"
-        length_match = re.search(r'longer than (\d+)|more than (\d+) character', query_lower)
-        if length_match:
-            length_val = int(length_match.group(1) or length_match.group(2))
-            parsed_filters["min_length"] = length_val + 1
-        
-        # Parse "containing letter X" or "contain letter X" or "contains the letter X"
-        char_match = re.search(r'contain(?:s|ing)?\s+(?:the\s+)?(?:letter\s+)?([a-z])', query_lower)
-        if char_match:
-            parsed_filters["contains_character"] = char_match.group(1)
+        # "longer than X characters" or "more than X characters"
+        if "min_length" in found:
+            parsed_filters["min_length"] = int(found["min_length"]) + 1
         
-        # Parse "first vowel" (interpret as 'a')
-        if "first vowel" in query_lower:
+        # "first vowel" (interpret as 'a') wins over "containing letter X"
+        if "first_vowel" in found:
             parsed_filters["contains_character"] = "a"
+        elif "contains_character" in found:
+            parsed_filters["contains_character"] = found["contains_character"]
         
         # If no filters parsed, return error
         if not parsed_filters:
@@ -130,42 +638,33 @@ async def filter_by_natural_language(query: str = Query(..., description="Natura
                     status_code=422, 
                     detail="Query parsed but resulted in conflicting filters"
                 )
-        
-        # Apply filters
-        data = load_data()
-        
-        if "is_palindrome" in parsed_filters:
-            data = [d for d in data if d["properties"]["is_palindrome"] == parsed_filters["is_palindrome"]]
-        
-        if "word_count" in parsed_filters:
-            data = [d for d in data if d["properties"]["word_count"] == parsed_filters["word_count"]]
-        
-        if "min_length" in parsed_filters:
-            data = [d for d in data if d["properties"]["length"] >= parsed_filters["min_length"]]
-        
-        if "max_length" in parsed_filters:
-            data = [d for d in data if d["properties"]["length"] <= parsed_filters["max_length"]]
-        
-        if "contains_character" in parsed_filters:
-            data = [d for d in data if parsed_filters["contains_character"] in d["value"]]
-        
-        return {
-            "data": data,
-            "count": len(data),
-            "interpreted_query": {
-                "original": query,
-                "parsed_filters": parsed_filters
-            }
-        }
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Unable to parse natural language query: {str(e)}")
+    
+    # Apply filters, unless the client's copy is still current. Store errors
+    # are server faults, so they stay outside the query parsing try block.
+    with _cache_lock:
+        etag = _etag(load_cache(), query)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+        data = filter_records(parsed_filters)
+    
+    return _json_response({
+        "data": data,
+        "count": len(data),
+        "interpreted_query": {
+            "original": query,
+            "parsed_filters": parsed_filters
+        }
+    }, headers=_cache_headers(etag))
 
 
 @router.get("/strings", tags=["Strings"])
-async def get_strings(
+def get_strings(
+    request: Request,
     is_palindrome: Optional[str] = Query(None, description="Filter by palindrome status (true/false)"),
     min_length: Optional[int] = Query(None, description="Minimum string length"),
     max_length: Optional[int] = Query(None, description="Maximum string length"),
@@ -175,6 +674,9 @@ async def get_strings(
     """
     Get all strings with optional filtering
     
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
+    until the stored strings change.
+    
     Args:
         is_palindrome: Filter by palindrome status ("true" or "false")
         min_length: Minimum string length
@@ -188,8 +690,6 @@ async def get_strings(
     Raises:
         400: Invalid query parameter values or types
     """
-    data = load_data()
-    
     # Validate parameters
     if contains_character is not None and len(contains_character) != 1:
         raise HTTPException(status_code=400, detail="contains_character must be a single character")
@@ -206,41 +706,36 @@ async def get_strings(
     # Track applied filters
     filters_applied = {}
     
-    # Filter by palindrome
     if is_palindrome is not None:
-        is_palindrome_bool = is_palindrome.lower() == "true"
-        data = [d for d in data if d["properties"]["is_palindrome"] == is_palindrome_bool]
-        filters_applied["is_palindrome"] = is_palindrome_bool
+        filters_applied["is_palindrome"] = is_palindrome.lower() == "true"
     
-    # Filter by min_length
     if min_length is not None:
-        data = [d for d in data if d["properties"]["length"] >= min_length]
         filters_applied["min_length"] = min_length
     
-    # Filter by max_length
     if max_length is not None:
-        data = [d for d in data if d["properties"]["length"] <= max_length]
         filters_applied["max_length"] = max_length
     
-    # Filter by word_count
     if word_count is not None:
-        data = [d for d in data if d["properties"]["word_count"] == word_count]
         filters_applied["word_count"] = word_count
     
-    # Filter by contains_character (case-sensitive)
     if contains_character is not None:
-        data = [d for d in data if contains_character in d["value"]]
         filters_applied["contains_character"] = contains_character
     
-    return {
+    with _cache_lock:
+        etag = _etag(load_cache(), repr(sorted(filters_applied.items())))
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+        data = filter_records(filters_applied)
+    
+    return _json_response({
         "data": data,
         "count": len(data),
         "filters_applied": filters_applied
-    }
+    }, headers=_cache_headers(etag))
 
 
 @router.get("/strings/{string_value}", response_model=StringRecord, tags=["Strings"])
-async def get_string_by_value(string_value: str):
+def get_string_by_value(string_value: str):
     """
     Get a specific string by its value
     
@@ -253,17 +748,17 @@ async def get_string_by_value(string_value: str):
     Raises:
         404: If string not found
     """
-    data = load_data()
+    item = load_cache()["by_value"].get(string_value)
     
-    for item in data:
-        if item["value"] == string_value:
-            return StringRecord(**item)
+    if item is None:
+        raise HTTPException(status_code=404, detail="String does not exist in the system")
     
-    raise HTTPException(status_code=404, detail="String does not exist in the system")
+    # Stored records were validated on insert; response_model only documents them
+    return _json_response(item)
 
 
 @router.delete("/strings/{string_value}", status_code=status.HTTP_204_NO_CONTENT, tags=["Strings"])
-async def delete_string(string_value: str):
+def delete_string(string_value: str):
     """
     Delete a specific string by its value
     
@@ -273,14 +768,9 @@ async def delete_string(string_value: str):
     Raises:
         404: If string not found
     """
-    data = load_data()
-    
-    # Find and remove the string
-    original_length = len(data)
-    data = [item for item in data if item["value"] != string_value]
+    record = load_cache()["by_value"].get(string_value)
     
-    if len(data) == original_length:
+    if record is None or not delete_record(record):
         raise HTTPException(status_code=404, detail="String does not exist in the system")
-    
-    save_data(data)
+
     return None  # 204 No Content returns empty body
\ No newline at end of file
@@ -7,5 +7,9 @@ class Settings:
     PROJECT_NAME: str = "String Analyzer Service"
     DATA_FILE: str = os.getenv("DATA_FILE", "/tmp/data.json")
     PORT: int = int(os.getenv("PORT", 8000))
+    # Deletions tolerated in the data file before it is rewritten
+    COMPACT_THRESHOLD: int = int(os.getenv("COMPACT_THRESHOLD", 100))
+    # Keep strings in memory only, never touching DATA_FILE (for tests)
+    USE_MEMORY_STORE: bool = os.getenv("USE_MEMORY_STORE") == "1"
 
 settings = Settings()
\ No newline at end of file
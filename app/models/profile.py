@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Dict
 from datetime import datetime, timezone
+from collections import Counter
+from functools import lru_cache
 import hashlib
 
 
@@ -32,43 +34,92 @@ class StringRecord(BaseModel):
         Returns:
             StringRecord instance with computed properties
         """
-        # Generate SHA256 hash
-        sha_hash = hashlib.sha256(value.encode('utf-8')).hexdigest()
-        
-        # Check if palindrome (case-insensitive only, keep spaces and punctuation)
-        value_lower = value.lower()
-        is_palindrome = value_lower == value_lower[::-1]
-        
-        # Calculate length
-        length = len(value)
-        
-        # Count unique characters
-        unique_characters = len(set(value))
-        
-        # Count words (split by whitespace)
-        word_count = len(value.split())
-        
-        # Create character frequency map
-        character_frequency_map = {}
-        for char in value:
-            character_frequency_map[char] = character_frequency_map.get(char, 0) + 1
-        
-        # Create properties
-        props = StringProperties(
-            length=length,
-            is_palindrome=is_palindrome,
-            unique_characters=unique_characters,
-            word_count=word_count,
-            sha256_hash=sha_hash,
-            character_frequency_map=character_frequency_map
-        )
+        return cls.model_validate(build_record(value))
+
+
+# Longest string whose analysis compute_properties keeps around
+_MEMO_MAX_LENGTH = 256
+
+
+def compute_properties(value: str) -> dict:
+    """
+    Analyze a string
+    
+    Results for recently analyzed short strings are reused, so such a string
+    that is deleted and created again is not hashed and counted a second time.
+    
+    Args:
+        value: The string to analyze
         
-        # Create timestamp
-        created_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    Returns:
+        New dictionary with the fields of StringProperties
+    """
+    # Only short strings are memoized, so the cache's memory use stays bounded
+    if len(value) > _MEMO_MAX_LENGTH:
+        return _analyze(value)
+    properties = _analyze_memo(value)
+    # Copy so callers never share the cached dictionaries
+    return {**properties, "character_frequency_map": dict(properties["character_frequency_map"])}
+
+
+def _analyze(value: str) -> dict:
+    """Compute the properties of a string; use compute_properties instead"""
+    # Generate SHA256 hash (an identifier, not a security primitive)
+    sha_hash = hashlib.sha256(value.encode('utf-8'), usedforsecurity=False).hexdigest()
+    
+    # Check if palindrome (case-insensitive only, keep spaces and punctuation)
+    value_lower = value.lower()
+    # Compare the first half with the reversed second half only; the
+    # comparison stops at the first mismatching character
+    half = len(value_lower) // 2
+    is_palindrome = value_lower[:half] == value_lower[:~half:-1]
+    
+    # Calculate length
+    length = len(value)
+    
+    # Create character frequency map
+    character_frequency_map = dict(Counter(value))
+    
+    # Count unique characters
+    unique_characters = len(character_frequency_map)
+    
+    # Count words (split by whitespace)
+    word_count = len(value.split())
+    
+    return {
+        "length": length,
+        "is_palindrome": is_palindrome,
+        "unique_characters": unique_characters,
+        "word_count": word_count,
+        "sha256_hash": sha_hash,
+        "character_frequency_map": character_frequency_map,
+    }
+
+
+_analyze_memo = lru_cache(maxsize=1024)(_analyze)
+
+
+def build_record(value: str) -> dict:
+    """
+    Analyze a string into a plain record dictionary
+    
+    The dictionary has the same shape as StringRecord.model_dump(), without
+    going through Pydantic, and is what the data file stores.
+    
+    Args:
+        value: The string to analyze
         
-        return cls(
-            id=sha_hash,
-            value=value,
-            properties=props,
-            created_at=created_at
-        )
\ No newline at end of file
+    Returns:
+        Dictionary with id, value, properties and created_at
+    """
+    properties = compute_properties(value)
+    
+    # Create timestamp
+    created_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    
+    return {
+        "id": properties["sha256_hash"],
+        "value": value,
+        "properties": properties,
+        "created_at": created_at,
+    }
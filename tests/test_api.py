@@ -4,41 +4,60 @@ Run with: pytest test_api.py -v
 """
 import pytest
 from fastapi.testclient import TestClient
-import os
+import asyncio
+import httpx
 import json
 
-# Test data file is set in conftest.py
-TEST_DATA_FILE = "test_data.json"
-
+from app.api.routes import append_records, reset_store
+from app.core.config import settings
 from app.main import app
+from app.models.profile import StringRecord, build_record, compute_properties
 
-client = TestClient(app)
 
-@pytest.fixture(autouse=True, scope="function")
-def cleanup():
-    """Clean up test data before and after each test"""
-    # Clean up before test
-    if os.path.exists(TEST_DATA_FILE):
-        os.remove(TEST_DATA_FILE)
-    
-    # Also clear any data.json if it exists
-    if os.path.exists("data.json"):
-        os.remove("data.json")
-    
-    yield
-    
-    # Clean up after test
-    if os.path.exists(TEST_DATA_FILE):
-        os.remove(TEST_DATA_FILE)
-    
-    if os.path.exists("data.json"):
-        os.remove("data.json")
+@pytest.fixture(scope="session")
+def client():
+    """One app and TestClient shared by the whole test session"""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def clean_store(tmp_path, monkeypatch):
+    """Start a test with an empty in-memory store"""
+    # Only tests that read or write stored strings need this. The store reads
+    # settings on every call, so nothing has to be reloaded. Tests of the
+    # data file itself switch USE_MEMORY_STORE back off.
+    monkeypatch.setattr(settings, "DATA_FILE", str(tmp_path / "test_data.json"))
+    monkeypatch.setattr(settings, "USE_MEMORY_STORE", True)
+    reset_store()
+
+
+# Strings the filtering tests query against
+SEED_VALUES = [
+    "racecar",  # palindrome, 7 chars, 1 word
+    "hello world",  # not palindrome, 11 chars, 2 words
+    "a",  # palindrome, 1 char, 1 word
+    "test data",  # not palindrome, 9 chars, 2 words
+]
+
+
+@pytest.fixture(scope="module")
+def seed_records():
+    """Analyzed records for SEED_VALUES, built once per module"""
+    return [build_record(value) for value in SEED_VALUES]
+
+
+@pytest.fixture
+def seeded_client(client, clean_store, seed_records):
+    """Client whose store holds SEED_VALUES, inserted without HTTP requests"""
+    append_records(seed_records)
+    return client
 
 
 class TestPostStrings:
     """Test POST /strings endpoint"""
     
-    def test_create_string_success(self):
+    def test_create_string_success(self, client, clean_store):
         """Test creating a new string returns 201"""
         response = client.post("/strings", json={"value": "hello"})
         assert response.status_code == 201
@@ -48,7 +67,7 @@ class TestPostStrings:
         assert "properties" in data
         assert "created_at" in data
         
-    def test_create_duplicate_string(self):
+    def test_create_duplicate_string(self, client, clean_store):
         """Test creating duplicate string returns 409"""
         # Create first string
         client.post("/strings", json={"value": "test"})
@@ -56,73 +75,118 @@ class TestPostStrings:
         response = client.post("/strings", json={"value": "test"})
         assert response.status_code == 409
         
-    def test_missing_value_field(self):
+    def test_missing_value_field(self, client):
         """Test missing 'value' field returns 400"""
         response = client.post("/strings", json={})
         assert response.status_code == 400
         
-    def test_invalid_data_type(self):
+    def test_invalid_data_type(self, client):
         """Test invalid data type for 'value' returns 422"""
         response = client.post("/strings", json={"value": 123})
         assert response.status_code == 422
         
-    def test_null_value(self):
+    def test_null_value(self, client):
         """Test null value returns 400"""
         response = client.post("/strings", json={"value": None})
         assert response.status_code == 400
 
 
+class TestPostStringsBulk:
+    """Test POST /strings:bulk endpoint"""
+    
+    def test_bulk_create(self, client, clean_store):
+        """Test bulk create reports a status per item and stores new strings"""
+        client.post("/strings", json={"value": "existing"})
+        response = client.post("/strings:bulk", json=[
+            {"value": "first"},
+            {"value": "existing"},
+            {"value": "first"},
+            {"value": 123},
+            {},
+        ])
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["status"] for item in data["data"]] == [201, 409, 409, 422, 400]
+        assert data["data"][0]["record"]["value"] == "first"
+        assert data["count"] == 5
+        assert data["created"] == 1
+        
+        assert client.get("/strings/first").status_code == 200
+        assert client.get("/strings").json()["count"] == 2
+        
+    def test_bulk_requires_list(self, client):
+        """Test a non-list body returns 422"""
+        response = client.post("/strings:bulk", json={"value": "hello"})
+        assert response.status_code == 422
+
+
+@pytest.mark.usefixtures("clean_store")
+class TestConcurrentPosts:
+    """Test POST /strings under concurrent requests"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_creates(self):
+        """Test concurrent POSTs store every new string once"""
+        values = [f"string {i}" for i in range(10)] + ["racecar"] * 5
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*[ac.post("/strings", json={"value": value}) for value in values])
+            
+            statuses = [response.status_code for response in responses]
+            assert statuses.count(201) == 11
+            assert statuses.count(409) == 4
+            assert (await ac.get("/strings")).json()["count"] == 11
+
+
 class TestStringProperties:
     """Test string property calculations"""
     
-    def test_palindrome_case_insensitive(self):
-        """Test palindrome detection is case-insensitive"""
-        response = client.post("/strings", json={"value": "RaceCar"})
+    def test_properties_in_response(self, client, clean_store):
+        """Test POST /strings returns the computed properties"""
+        response = client.post("/strings", json={"value": "hello world"})
         assert response.status_code == 201
         data = response.json()
-        assert data["properties"]["is_palindrome"] == True
+        assert data["properties"] == compute_properties("hello world")
+        
+    def test_palindrome_case_insensitive(self):
+        """Test palindrome detection is case-insensitive"""
+        assert compute_properties("RaceCar")["is_palindrome"] == True
         
     def test_non_palindrome(self):
         """Test non-palindrome detection"""
-        response = client.post("/strings", json={"value": "world"})  # Changed from "hello" to avoid conflicts
-        assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
-        data = response.json()
-        assert data["properties"]["is_palindrome"] == False
+        assert compute_properties("world")["is_palindrome"] == False
         
     def test_length_calculation(self):
         """Test length calculation"""
-        response = client.post("/strings", json={"value": "hello world"})
-        data = response.json()
-        assert data["properties"]["length"] == 11
+        assert compute_properties("hello world")["length"] == 11
         
     def test_word_count(self):
         """Test word count calculation"""
-        response = client.post("/strings", json={"value": "hello world test"})
-        data = response.json()
-        assert data["properties"]["word_count"] == 3
+        assert compute_properties("hello world test")["word_count"] == 3
         
     def test_unique_characters(self):
         """Test unique character count"""
-        response = client.post("/strings", json={"value": "hello"})
-        assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
-        data = response.json()
-        assert data["properties"]["unique_characters"] == 4  # h, e, l, o
+        assert compute_properties("hello")["unique_characters"] == 4  # h, e, l, o
         
     def test_character_frequency(self):
         """Test character frequency map"""
-        response = client.post("/strings", json={"value": "test"})  # Changed from "hello" to avoid conflicts
-        assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
-        data = response.json()
-        freq_map = data["properties"]["character_frequency_map"]
+        freq_map = compute_properties("test")["character_frequency_map"]
         assert freq_map["t"] == 2
         assert freq_map["e"] == 1
         assert freq_map["s"] == 1
+        
+    def test_sha256_hash(self):
+        """Test the hash is the SHA-256 hex digest of the UTF-8 value"""
+        assert compute_properties("hello")["sha256_hash"] == (
+            "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+        )
 
 
+@pytest.mark.usefixtures("clean_store")
 class TestGetString:
     """Test GET /strings/{string_value} endpoint"""
     
-    def test_get_existing_string(self):
+    def test_get_existing_string(self, client):
         """Test getting an existing string returns 200"""
         client.post("/strings", json={"value": "test"})
         response = client.get("/strings/test")
@@ -130,35 +194,22 @@ class TestGetString:
         data = response.json()
         assert data["value"] == "test"
         
-    def test_get_nonexistent_string(self):
+    def test_get_nonexistent_string(self, client):
         """Test getting non-existent string returns 404"""
         response = client.get("/strings/nonexistent")
         assert response.status_code == 404
 
 
+def _values(response) -> list:
+    """Values of the strings in a list response, in order"""
+    return [item["value"] for item in response.json()["data"]]
+
+
+@pytest.mark.usefixtures("seeded_client")
 class TestGetStringsWithFilters:
     """Test GET /strings with query parameters"""
     
-    @pytest.fixture(autouse=True)
-    def setup_test_data(self):
-        """Setup test data for each test"""
-        # Ensure clean state
-        if os.path.exists(TEST_DATA_FILE):
-            os.remove(TEST_DATA_FILE)
-            
-        # Create test data
-        client.post("/strings", json={"value": "racecar"})  # palindrome, 7 chars, 1 word
-        client.post("/strings", json={"value": "hello world"})  # not palindrome, 11 chars, 2 words
-        client.post("/strings", json={"value": "a"})  # palindrome, 1 char, 1 word
-        client.post("/strings", json={"value": "test data"})  # not palindrome, 9 chars, 2 words
-        
-        yield
-        
-        # Cleanup after test
-        if os.path.exists(TEST_DATA_FILE):
-            os.remove(TEST_DATA_FILE)
-        
-    def test_filter_by_palindrome(self):
+    def test_filter_by_palindrome(self, client):
         """Test filtering by palindrome status"""
         # First, verify setup data
         all_strings = client.get("/strings").json()
@@ -173,65 +224,89 @@ class TestGetStringsWithFilters:
         assert data["count"] == 2, f"Expected 2 palindromes (racecar, a), got {data['count']}: {palindromes}"
         assert all(item["properties"]["is_palindrome"] for item in data["data"])
         
-    def test_filter_by_min_length(self):
+    def test_filter_by_min_length(self, client):
         """Test filtering by minimum length"""
         response = client.get("/strings?min_length=5")
         data = response.json()
         assert all(item["properties"]["length"] >= 5 for item in data["data"])
+        assert _values(response) == ["racecar", "hello world", "test data"]
         
-    def test_filter_by_max_length(self):
+    def test_filter_by_max_length(self, client):
         """Test filtering by maximum length"""
         response = client.get("/strings?max_length=5")
         data = response.json()
         assert all(item["properties"]["length"] <= 5 for item in data["data"])
+        assert _values(response) == ["a"]
         
-    def test_filter_by_word_count(self):
+    def test_filter_by_word_count(self, client):
         """Test filtering by word count"""
         response = client.get("/strings?word_count=2")
         data = response.json()
         assert all(item["properties"]["word_count"] == 2 for item in data["data"])
+        assert _values(response) == ["hello world", "test data"]
         
-    def test_filter_by_contains_character(self):
+    def test_filter_by_contains_character(self, client):
         """Test filtering by contains character"""
         response = client.get("/strings?contains_character=a")
         data = response.json()
         assert all("a" in item["value"] for item in data["data"])
+        assert _values(response) == ["racecar", "a", "test data"]
         
-    def test_multiple_filters(self):
+    def test_multiple_filters(self, client):
         """Test combining multiple filters"""
         response = client.get("/strings?is_palindrome=true&word_count=1")
         data = response.json()
         palindromes = [item["value"] for item in data["data"]]
         assert data["count"] == 2, f"Expected 2 palindromes with 1 word, got {data['count']}: {palindromes}"
         
-    def test_invalid_contains_character(self):
+    def test_filter_by_not_palindrome(self, client):
+        """Test is_palindrome=false keeps every non-palindrome"""
+        assert _values(client.get("/strings?is_palindrome=false")) == ["hello world", "test data"]
+        assert _values(client.get("/strings?is_palindrome=false&contains_character=a")) == ["test data"]
+        
+    def test_filter_by_length_range(self, client):
+        """Test combined min_length and max_length bounds are inclusive"""
+        assert _values(client.get("/strings?min_length=5&max_length=10")) == ["racecar", "test data"]
+        assert _values(client.get("/strings?min_length=7&max_length=7")) == ["racecar"]
+        assert _values(client.get("/strings?min_length=1&max_length=11")) == SEED_VALUES
+        
+    def test_filter_by_inverted_length_range(self, client):
+        """Test max_length below min_length matches nothing"""
+        response = client.get("/strings?min_length=10&max_length=5")
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+        
+    def test_filter_by_missing_index_key(self, client):
+        """Test a word count or character no record has matches nothing"""
+        assert client.get("/strings?word_count=3").json()["count"] == 0
+        assert client.get("/strings?contains_character=z").json()["count"] == 0
+        assert client.get("/strings?word_count=1&contains_character=z").json()["count"] == 0
+        
+    def test_filters_after_delete(self, client):
+        """Test deleted strings drop out of every filter and can be re-added"""
+        assert _values(client.get("/strings?is_palindrome=true")) == ["racecar", "a"]
+        assert client.delete("/strings/racecar").status_code == 204
+        
+        assert _values(client.get("/strings?is_palindrome=true")) == ["a"]
+        assert _values(client.get("/strings?is_palindrome=false")) == ["hello world", "test data"]
+        assert _values(client.get("/strings?min_length=7&max_length=7")) == []
+        assert _values(client.get("/strings?contains_character=r")) == ["hello world"]
+        assert _values(client.get("/strings")) == ["hello world", "a", "test data"]
+        
+        client.post("/strings", json={"value": "racecar"})
+        assert _values(client.get("/strings?is_palindrome=true")) == ["a", "racecar"]
+        
+    def test_invalid_contains_character(self, client):
         """Test invalid contains_character (not single char) returns 400"""
         response = client.get("/strings?contains_character=ab")
         assert response.status_code == 400
 
 
+@pytest.mark.usefixtures("seeded_client")
 class TestNaturalLanguageFilter:
     """Test GET /strings/filter-by-natural-language endpoint"""
     
-    @pytest.fixture(autouse=True)
-    def setup_test_data(self):
-        """Setup test data for each test"""
-        # Ensure clean state
-        if os.path.exists(TEST_DATA_FILE):
-            os.remove(TEST_DATA_FILE)
-            
-        # Create test data
-        client.post("/strings", json={"value": "racecar"})
-        client.post("/strings", json={"value": "hello world"})
-        client.post("/strings", json={"value": "a"})
-        
-        yield
-        
-        # Cleanup after test
-        if os.path.exists(TEST_DATA_FILE):
-            os.remove(TEST_DATA_FILE)
-        
-    def test_single_word_palindrome(self):
+    def test_single_word_palindrome(self, client):
         """Test 'all single word palindromic strings'"""
         response = client.get("/strings/filter-by-natural-language?query=all single word palindromic strings")
         assert response.status_code == 200
@@ -240,28 +315,29 @@ class TestNaturalLanguageFilter:
         assert data["interpreted_query"]["parsed_filters"]["word_count"] == 1
         assert data["interpreted_query"]["parsed_filters"]["is_palindrome"] == True
         
-    def test_longer_than_query(self):
+    def test_longer_than_query(self, client):
         """Test 'strings longer than 5 characters'"""
         response = client.get("/strings/filter-by-natural-language?query=strings longer than 5 characters")
         data = response.json()
         assert data["interpreted_query"]["parsed_filters"]["min_length"] == 6
         
-    def test_contains_letter_query(self):
+    def test_contains_letter_query(self, client):
         """Test 'strings containing the letter a'"""
         response = client.get("/strings/filter-by-natural-language?query=strings containing the letter a")
         data = response.json()
         assert data["interpreted_query"]["parsed_filters"]["contains_character"] == "a"
         
-    def test_unparseable_query(self):
+    def test_unparseable_query(self, client):
         """Test unparseable query returns 400"""
         response = client.get("/strings/filter-by-natural-language?query=gibberish xyz 123")
         assert response.status_code == 400
 
 
+@pytest.mark.usefixtures("clean_store")
 class TestDeleteString:
     """Test DELETE /strings/{string_value} endpoint"""
     
-    def test_delete_existing_string(self):
+    def test_delete_existing_string(self, client):
         """Test deleting existing string returns 204"""
         client.post("/strings", json={"value": "to_delete"})
         response = client.delete("/strings/to_delete")
@@ -271,11 +347,138 @@ class TestDeleteString:
         get_response = client.get("/strings/to_delete")
         assert get_response.status_code == 404
         
-    def test_delete_nonexistent_string(self):
+    def test_delete_nonexistent_string(self, client):
         """Test deleting non-existent string returns 404"""
         response = client.delete("/strings/nonexistent")
         assert response.status_code == 404
 
 
+@pytest.mark.usefixtures("clean_store")
+class TestConditionalGet:
+    """Test ETag / If-None-Match handling on the filtering endpoints"""
+    
+    def test_unchanged_data_returns_304(self, client):
+        """Test a matching If-None-Match returns 304 until the data changes"""
+        client.post("/strings", json={"value": "racecar"})
+        response = client.get("/strings?is_palindrome=true")
+        etag = response.headers["ETag"]
+        
+        response = client.get("/strings?is_palindrome=true", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        
+        client.post("/strings", json={"value": "madam"})
+        response = client.get("/strings?is_palindrome=true", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+        assert response.headers["ETag"] != etag
+    
+    def test_etag_depends_on_filters(self, client):
+        """Test different filters get different ETags"""
+        client.post("/strings", json={"value": "racecar"})
+        etag = client.get("/strings").headers["ETag"]
+        
+        response = client.get("/strings?word_count=1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    
+    def test_natural_language_returns_304(self, client):
+        """Test the natural language endpoint honours If-None-Match"""
+        client.post("/strings", json={"value": "racecar"})
+        url = "/strings/filter-by-natural-language?query=palindromic strings"
+        etag = client.get(url).headers["ETag"]
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+class TestDataCache:
+    """Test the in-memory cache and JSON Lines data file"""
+    
+    @pytest.fixture(autouse=True)
+    def use_data_file(self, clean_store, monkeypatch):
+        """Store strings in the data file instead of memory only"""
+        monkeypatch.setattr(settings, "USE_MEMORY_STORE", False)
+    
+    def test_external_file_change_is_picked_up(self, client):
+        """Test rewriting the data file outside the API invalidates the cache"""
+        client.post("/strings", json={"value": "cached"})
+        assert client.get("/strings").json()["count"] == 1
+        
+        with open(settings.DATA_FILE, "w", encoding="utf-8") as f:
+            f.write("")
+        
+        assert client.get("/strings").json()["count"] == 0
+        assert client.get("/strings/cached").status_code == 404
+    
+    def test_delete_appends_tombstone(self, client):
+        """Test deleting a string appends a tombstone instead of rewriting the file"""
+        client.post("/strings", json={"value": "first"})
+        client.post("/strings", json={"value": "second"})
+        client.delete("/strings/first")
+        
+        with open(settings.DATA_FILE, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert [line.get("value") for line in lines[:2]] == ["first", "second"]
+        assert lines[2] == {"deleted": lines[0]["id"]}
+    
+    def test_compaction_drops_tombstones(self, client, monkeypatch):
+        """Test the data file is rewritten once the tombstone threshold is reached"""
+        monkeypatch.setattr(settings, "COMPACT_THRESHOLD", 1)
+        client.post("/strings", json={"value": "first"})
+        client.post("/strings", json={"value": "second"})
+        client.delete("/strings/first")
+        
+        with open(settings.DATA_FILE, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert [line["value"] for line in lines] == ["second"]
+    
+    def test_legacy_json_array_is_migrated(self, client):
+        """Test a data file in the old JSON array format is still readable"""
+        with open(settings.DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump([StringRecord.create("legacy").model_dump()], f, indent=4)
+        
+        assert client.get("/strings/legacy").status_code == 200
+        assert client.post("/strings", json={"value": "new"}).status_code == 201
+        assert client.get("/strings").json()["count"] == 2
+    
+    def test_append_after_torn_write(self, client):
+        """Test a record appended after an interrupted write survives a reload"""
+        client.post("/strings", json={"value": "one"})
+        with open(settings.DATA_FILE, "a", encoding="utf-8") as f:
+            f.write('{"id":"abc","val')
+        assert client.post("/strings", json={"value": "two"}).status_code == 201
+        
+        # Change the file outside the API so it is read back from disk
+        with open(settings.DATA_FILE, "a", encoding="utf-8") as f:
+            f.write("1\n")
+        
+        data = client.get("/strings").json()["data"]
+        assert [item["value"] for item in data] == ["one", "two"]
+    
+    def test_corrupt_legacy_file_is_left_untouched(self, client):
+        """Test an unreadable old-format data file fails loudly instead of being emptied"""
+        corrupt = '[{"id": "x", "value": "a"'
+        with open(settings.DATA_FILE, "w", encoding="utf-8") as f:
+            f.write(corrupt)
+        
+        with pytest.raises(ValueError):
+            client.get("/strings")
+        # A server-side fault, not reported as an unparseable query
+        with pytest.raises(ValueError):
+            client.get("/strings/filter-by-natural-language?query=palindromic strings")
+        
+        with open(settings.DATA_FILE, encoding="utf-8") as f:
+            assert f.read() == corrupt
+    
+    def test_lines_that_are_not_records_are_skipped(self, client):
+        """Test valid JSON lines that aren't records don't break loading"""
+        client.post("/strings", json={"value": "kept"})
+        with open(settings.DATA_FILE, "a", encoding="utf-8") as f:
+            f.write('1\n{"foo": 1}\n{"id": "x"}\n')
+        
+        data = client.get("/strings").json()["data"]
+        assert [item["value"] for item in data] == ["kept"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file